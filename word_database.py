@@ -1,14 +1,24 @@
 import sqlite3
 import json
 import atexit
+import hashlib
+
+SHAPE_KEY_BYTES = 8
+LEGACY_DIGEST_BYTES = 28
+
+def hash_canonical_form(canonical_form):
+    """Returns the SHA-224 digest of a canonical form; its leading bytes are the shape key."""
+    return hashlib.sha224(canonical_form.encode()).digest()
 
 class WordDatabase:
     def __init__(self, db_name, batch_size=1000):
+        self.batch_size = batch_size
+        self.batch = []
         self.conn = sqlite3.connect(db_name)
         self.create_table()
+        self.migrate_normalized_shape()
+        self.create_indexes()
         self.conn.commit()
-        self.batch_size = batch_size
-        self.batch = []
         atexit.register(self.flush)
 
     def create_table(self):
@@ -17,25 +27,120 @@ class WordDatabase:
             CREATE TABLE IF NOT EXISTS word_shapes (
                 word TEXT PRIMARY KEY,
                 shape TEXT,
-                normalized_shape TEXT,
+                normalized_shape BLOB,
                 polygonal_shape TEXT,
                 polygonal_area REAL,
                 perimeter REAL
             )
         """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS shape_keys (
+                shape_key BLOB PRIMARY KEY,
+                digest BLOB NOT NULL,
+                canonical_form TEXT
+            )
+        """)
         self.conn.commit()
 
+    def create_indexes(self):
+        cursor = self.conn.cursor()
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_shapes_normalized_shape ON word_shapes (normalized_shape)")
+        self.conn.commit()
+
+    def migrate_normalized_shape(self):
+        """Converts a database that stores normalized_shape as a JSON-encoded SHA-224 integer
+        into one that stores the fixed-width shape key. The full digests are kept in shape_keys
+        so later inserts can still be checked for collisions."""
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA table_info(word_shapes)")
+        column_types = {column[1]: column[2].upper() for column in cursor.fetchall()}
+        if column_types.get("normalized_shape") != "TEXT":
+            return
+
+        legacy_keys = {}
+        cursor.execute("SELECT DISTINCT normalized_shape FROM word_shapes")
+        for (legacy_shape,) in cursor.fetchall():
+            digest = json.loads(legacy_shape).to_bytes(LEGACY_DIGEST_BYTES, "big")
+            shape_key = digest[:SHAPE_KEY_BYTES]
+            if legacy_keys.get(shape_key, (legacy_shape, digest))[1] != digest:
+                raise Exception(f"Database migration failed: shape key collision on {shape_key.hex()}.")
+            legacy_keys[shape_key] = (legacy_shape, digest)
+
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("DROP TABLE IF EXISTS word_shapes_migrated")
+            cursor.execute("DROP TABLE IF EXISTS temp.legacy_shape_keys")
+            cursor.execute("""
+                CREATE TABLE word_shapes_migrated (
+                    word TEXT PRIMARY KEY,
+                    shape TEXT,
+                    normalized_shape BLOB,
+                    polygonal_shape TEXT,
+                    polygonal_area REAL,
+                    perimeter REAL
+                )
+            """)
+            cursor.execute("CREATE TEMP TABLE legacy_shape_keys (legacy_shape TEXT PRIMARY KEY, shape_key BLOB)")
+            cursor.executemany("INSERT INTO legacy_shape_keys VALUES (?, ?)", [(legacy_shape, shape_key) for shape_key, (legacy_shape, _) in legacy_keys.items()])
+            cursor.execute("""
+                INSERT INTO word_shapes_migrated (word, shape, normalized_shape, polygonal_shape, polygonal_area, perimeter)
+                SELECT w.word, w.shape, l.shape_key, w.polygonal_shape, w.polygonal_area, w.perimeter
+                FROM word_shapes w
+                LEFT JOIN legacy_shape_keys l ON l.legacy_shape = w.normalized_shape
+            """)
+            cursor.executemany("INSERT OR IGNORE INTO shape_keys (shape_key, digest) VALUES (?, ?)", [(shape_key, digest) for shape_key, (_, digest) in legacy_keys.items()])
+            cursor.execute("DROP TABLE legacy_shape_keys")
+            cursor.execute("DROP TABLE word_shapes")
+            cursor.execute("ALTER TABLE word_shapes_migrated RENAME TO word_shapes")
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        self.conn.execute("VACUUM")
+
+    def shape_key(self, normalized_shape):
+        """Returns the fixed-width shape key and full digest of a canonical form."""
+        digest = hash_canonical_form(normalized_shape)
+        return digest[:SHAPE_KEY_BYTES], digest
+
     def store_word(self, word, shape, normalized_shape, polygonal_shape, polygonal_area, perimeter):
-        self.batch.append((word, json.dumps(shape), json.dumps(normalized_shape), json.dumps(polygonal_shape), polygonal_area, perimeter))
+        shape_key, digest = self.shape_key(normalized_shape)
+        self.batch.append((word, json.dumps(shape), shape_key, json.dumps(polygonal_shape), polygonal_area, perimeter, digest, normalized_shape))
         if len(self.batch) >= self.batch_size:
             self.flush()
 
+    def store_shape_keys(self, cursor):
+        """Records each new shape key alongside its canonical form.
+        Returns the rows whose key is already held by a different canonical form."""
+        known_keys = {}
+        colliding_rows = []
+        for row in self.batch:
+            shape_key, digest, canonical_form = row[2], row[6], row[7]
+            if shape_key not in known_keys:
+                cursor.execute("SELECT digest, canonical_form FROM shape_keys WHERE shape_key = ?", (shape_key,))
+                known_keys[shape_key] = cursor.fetchone()
+            existing = known_keys[shape_key]
+            if existing is None:
+                cursor.execute("INSERT INTO shape_keys (shape_key, digest, canonical_form) VALUES (?, ?, ?)", (shape_key, digest, canonical_form))
+                known_keys[shape_key] = (digest, canonical_form)
+            elif existing[0] != digest or existing[1] not in (None, canonical_form):
+                colliding_rows.append(row)
+            elif existing[1] is None:
+                cursor.execute("UPDATE shape_keys SET canonical_form = ? WHERE shape_key = ?", (canonical_form, shape_key))
+                known_keys[shape_key] = (digest, canonical_form)
+        return colliding_rows
+
     def flush(self):
         if self.batch:
             cursor = self.conn.cursor()
-            cursor.executemany("INSERT OR IGNORE INTO word_shapes (word, shape, normalized_shape, polygonal_shape, polygonal_area, perimeter) VALUES (?, ?, ?, ?, ?, ?)", self.batch)
+            colliding_rows = self.store_shape_keys(cursor)
+            stored_rows = [row[:6] for row in self.batch if row not in colliding_rows]
+            cursor.executemany("INSERT OR IGNORE INTO word_shapes (word, shape, normalized_shape, polygonal_shape, polygonal_area, perimeter) VALUES (?, ?, ?, ?, ?, ?)", stored_rows)
             self.conn.commit()
             self.batch = []
+            if colliding_rows:
+                collisions = ', '.join(f"'{row[0]}' ({row[2].hex()})" for row in colliding_rows)
+                raise Exception(f"Shape key collision: {len(colliding_rows)} word(s) were not written because their shape key is held by a different canonical form: {collisions}. All other words in the batch were written.")
 
     def __del__(self):
         self.flush()
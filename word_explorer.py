@@ -232,15 +232,21 @@ class WordShapeApp(QMainWindow):
             index_of_input = words_with_same_shape.index(word)
             words_with_same_shape.insert(0, words_with_same_shape.pop(index_of_input))
             self.display_many_words(words_with_same_shape)
-            self.output_field.setText(f"Word shape is: {shape_of_word[0]}\n" + '\n'.join(words_with_same_shape))
+            self.output_field.setText(f"Word shape is: {self.format_shape(shape_of_word[0])}\n" + '\n'.join(words_with_same_shape))
         except ValueError as e:
             self.output_field.setText(str(e))
 
+    def format_shape(self, shape):
+        """Graph shapes are stored as binary keys; show them as hex."""
+        if isinstance(shape, bytes):
+            return shape.hex()
+        return shape
+
     def most_common_word_shape(self):
         result = self.word_database.most_common_word_shape(self.mode_columns[self.current_display_mode])
         shape_of_word = self.word_database.get_shape_of_word(result[0], self.mode_columns[self.current_display_mode])
         self.display_many_words(result)
-        self.output_field.setText(f"The most common word shape is: {shape_of_word[0]}\n" + '\n'.join(result))
+        self.output_field.setText(f"The most common word shape is: {self.format_shape(shape_of_word[0])}\n" + '\n'.join(result))
 
     def percentage_unique_shapes(self):
         result = self.word_database.percentage_unique_shapes(self.mode_columns[self.current_display_mode])
@@ -254,7 +260,7 @@ class WordShapeApp(QMainWindow):
         result = self.word_database.longest_shared_shape_word(self.mode_columns[self.current_display_mode])
         shape_of_word = self.word_database.get_shape_of_word(result[0], self.mode_columns[self.current_display_mode])
         self.display_many_words(result)
-        self.output_field.setText(f"The longest word with a shared shape is: {shape_of_word[0]}\n" + '\n'.join(result))
+        self.output_field.setText(f"The longest word with a shared shape is: {self.format_shape(shape_of_word[0])}\n" + '\n'.join(result))
 
     def random_word_shared_shape(self):
         result = self.word_database.random_word_shared_shape(self.mode_columns[self.current_display_mode])
@@ -262,7 +268,7 @@ class WordShapeApp(QMainWindow):
         try:
             words_with_same_shape = self.word_database.find_words_with_same_shape(result[0],self.mode_columns[self.current_display_mode])
             self.display_many_words(words_with_same_shape)
-            self.output_field.setText(f"Word shape is: {shape_of_word[0]}\n" + '\n'.join(words_with_same_shape))
+            self.output_field.setText(f"Word shape is: {self.format_shape(shape_of_word[0])}\n" + '\n'.join(words_with_same_shape))
         except ValueError as e:
             self.output_field.setText(str(e))
 
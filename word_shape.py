@@ -3,8 +3,8 @@ import os
 import math
 import scott as st
 import numpy as np
-import hashlib
 from letter_wheel import LetterWheel
+from word_database import hash_canonical_form
 
 class WordShape:
     def __init__(self):
@@ -92,7 +92,7 @@ class WordShape:
         """'Rotate' a word such that it begins with 'a'.
         Also reverse the word and perform the same rotation.
         Create a graph from each word and compute its canonical form using scott.
-        Hash each word and return the hash of highest value.
+        Hash each canonical form and return the canonical form whose hash is of highest value.
         """
         while word[0:2] == word[-2:][::-1] and len(word) > 2:
             word = word[:-1]
@@ -106,17 +106,12 @@ class WordShape:
         reflected_graph = self.create_graph(reflected_word)
         reversed_reflected_graph = self.create_graph(reversed_reflected_word)
 
-        cgraph = st.canonize.to_cgraph(graph)
-        reversed_cgraph = st.canonize.to_cgraph(reversed_graph)
-        reflected_cgraph = st.canonize.to_cgraph(reflected_graph)
-        reversed_reflected_cgraph = st.canonize.to_cgraph(reversed_reflected_graph)
+        cgraph = str(st.canonize.to_cgraph(graph))
+        reversed_cgraph = str(st.canonize.to_cgraph(reversed_graph))
+        reflected_cgraph = str(st.canonize.to_cgraph(reflected_graph))
+        reversed_reflected_cgraph = str(st.canonize.to_cgraph(reversed_reflected_graph))
 
-        hash1 = int(hashlib.sha224(str(cgraph).encode()).hexdigest(), 16)
-        hash2 = int(hashlib.sha224(str(reversed_cgraph).encode()).hexdigest(), 16)
-        hash3 = int(hashlib.sha224(str(reflected_cgraph).encode()).hexdigest(), 16)
-        hash4 = int(hashlib.sha224(str(reversed_reflected_cgraph).encode()).hexdigest(), 16)
-
-        return max(hash1, hash2, hash3, hash4)
+        return max(cgraph, reversed_cgraph, reflected_cgraph, reversed_reflected_cgraph, key=hash_canonical_form)
 
 class HiddenPrints:
     def __enter__(self):